@@ -7,51 +7,175 @@ Educational Matplotlib animation illustrating neural network training:
 - simple schematic network diagram with "activating" connections.
 
 The animation uses synthetic curves (no heavy ML frameworks),
-so it runs with only NumPy + Matplotlib.
+so it runs with only NumPy + Matplotlib (Numba is used if available).
 
 Author: Svetlana Romanova (SvetLuna)
 """
 
+import io
+import queue
+import threading
+
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib import gridspec, animation
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba, to_rgba_array
 
+try:
+    from numba import njit, types
+except ImportError:  # Numba is optional, fall back to plain NumPy
+    njit = types = None
 
-def generate_training_curves(n_epochs: int = 100, seed: int = 42):
+
+# Connection colors indexed by precompute_activation()'s color_idx: inactive, active
+CONNECTION_COLORS = ("gray", "#4C72B0")
+
+# Style of inactive connections, shared by precompute_activation() and the
+# initial (empty) frame of the animation
+INACTIVE_ALPHA = 0.08
+INACTIVE_LINEWIDTH = 1.0
+
+# Whether create_figure() has already reset Matplotlib to its default style
+_STYLE_APPLIED = False
+
+
+def _training_curves_numpy(n_epochs: int, seed: int):
     """
-    Generate synthetic training & validation loss and accuracy curves.
+    Plain NumPy implementation of the synthetic training curves.
 
-    Loss ~ exponential decay + noise
-    Accuracy ~ rising logistic curve + noise
+    Works in place on float32 arrays, reusing one scratch buffer for the
+    noise and one for the exponential decay across all four curves.
     """
     rng = np.random.default_rng(seed)
-    epochs = np.arange(n_epochs)
+    epochs = np.arange(n_epochs, dtype=np.float32)
+    noise = np.empty(n_epochs, dtype=np.float32)
+    decay = np.empty(n_epochs, dtype=np.float32)
+
+    def add_noise(curve, scale):
+        rng.standard_normal(dtype=np.float32, out=noise)
+        np.multiply(noise, scale, out=noise)
+        curve += noise
 
     # Loss curves (start higher, decay downwards)
-    train_loss = 1.5 * np.exp(-epochs / 22.0) + 0.05 * rng.normal(size=n_epochs)
-    val_loss = 1.8 * np.exp(-epochs / 25.0) + 0.07 * rng.normal(size=n_epochs)
-    train_loss = np.clip(train_loss, 0.02, None)
-    val_loss = np.clip(val_loss, 0.02, None)
+    np.exp(np.divide(epochs, -22.0, out=decay), out=decay)
+    train_loss = decay * 1.5
+    add_noise(train_loss, 0.05)
+
+    np.exp(np.divide(epochs, -25.0, out=decay), out=decay)
+    val_loss = decay * 1.8
+    add_noise(val_loss, 0.07)
+
+    np.clip(train_loss, 0.02, None, out=train_loss)
+    np.clip(val_loss, 0.02, None, out=val_loss)
+
+    # Accuracy curves (start ~0.5, go up to ~0.98);
+    # decay still holds exp(-epochs / 25)
+    train_acc = 1.0 - decay
+    train_acc *= 0.45
+    train_acc += 0.5
+    val_acc = train_acc - 0.02
+    add_noise(train_acc, 0.03)
+    add_noise(val_acc, 0.04)
+
+    np.clip(train_acc, 0.45, 0.99, out=train_acc)
+    np.clip(val_acc, 0.4, 0.99, out=val_acc)
+
+    return train_loss, val_loss, train_acc, val_acc
+
+
+if njit is not None:
 
-    # Accuracy curves (start ~0.5, go up to ~0.98)
-    base_acc = 0.5 + 0.45 * (1.0 - np.exp(-epochs / 25.0))
-    train_acc = base_acc + 0.03 * rng.normal(size=n_epochs)
-    val_acc = base_acc - 0.02 + 0.04 * rng.normal(size=n_epochs)
-    train_acc = np.clip(train_acc, 0.45, 0.99)
-    val_acc = np.clip(val_acc, 0.4, 0.99)
+    # Explicit signature: compiled (or loaded from cache) once at import,
+    # so calls skip the dispatcher's type lookup and first-call JIT
+    @njit(
+        types.UniTuple(types.float32[::1], 4)(types.int64, types.uint32),
+        cache=True,
+        fastmath=True,
+    )
+    def _training_curves_numba(n_epochs, seed):
+        """
+        Same curves as _training_curves_numpy, fused into a single loop.
+
+        Numba only has a process-global RNG, so this reseeds it with `seed`
+        (a uint32 derived by generate_training_curves).
+        """
+        np.random.seed(seed)
+        train_loss = np.empty(n_epochs, dtype=np.float32)
+        val_loss = np.empty(n_epochs, dtype=np.float32)
+        train_acc = np.empty(n_epochs, dtype=np.float32)
+        val_acc = np.empty(n_epochs, dtype=np.float32)
+
+        for i in range(n_epochs):
+            e = float(i)
+            decay_25 = np.exp(-e / 25.0)
+
+            # Loss curves (start higher, decay downwards)
+            train_loss[i] = max(1.5 * np.exp(-e / 22.0) + 0.05 * np.random.normal(), 0.02)
+            val_loss[i] = max(1.8 * decay_25 + 0.07 * np.random.normal(), 0.02)
+
+            # Accuracy curves (start ~0.5, go up to ~0.98)
+            base_acc = 0.5 + 0.45 * (1.0 - decay_25)
+            train_acc[i] = min(max(base_acc + 0.03 * np.random.normal(), 0.45), 0.99)
+            val_acc[i] = min(max(base_acc - 0.02 + 0.04 * np.random.normal(), 0.4), 0.99)
+
+        return train_loss, val_loss, train_acc, val_acc
+
+else:
+    _training_curves_numba = None
+
+
+def generate_training_curves(n_epochs: int = 100, seed: int = 42):
+    """
+    Generate synthetic training & validation loss and accuracy curves.
 
-    return epochs, train_loss, val_loss, train_acc, val_acc
+    Loss ~ exponential decay + noise
+    Accuracy ~ rising logistic curve + noise
+
+    Curves are float32 (plenty for plotting) and epochs int32.
+
+    `seed` may be None, an int, a sequence of ints or a np.random.SeedSequence.
+    Uses a fused Numba kernel when Numba is installed, plain NumPy otherwise.
+    Both are deterministic for a given seed, but draw noise from different
+    random streams, so the exact curves differ between the two.
+    """
+    if isinstance(seed, (np.random.Generator, np.random.BitGenerator)):
+        raise TypeError("seed must be None, an int, a sequence of ints or a SeedSequence, "
+                        f"not {type(seed).__name__}")
+
+    epochs = np.arange(n_epochs, dtype=np.int32)
+    if _training_curves_numba is not None:
+        # Numba's np.random.seed only takes 32 bits: hash the full seed down
+        # to a uint32 the same way NumPy would (and reject the same inputs)
+        seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        kernel_seed = seq.generate_state(1)[0]
+        curves = _training_curves_numba(n_epochs, kernel_seed)
+    else:
+        curves = _training_curves_numpy(n_epochs, seed)
+    return (epochs, *curves)
 
 
-def create_figure():
+def create_figure(fig=None):
     """
     Create Matplotlib figure with a grid for:
       - top: schematic NN
       - bottom left: loss curves
       - bottom right: accuracy curves
+
+    If `fig` is given (e.g. a figure embedded in a GUI), it is cleared and
+    reused instead of allocating a new one.
     """
-    plt.style.use("default")
-    fig = plt.figure(figsize=(10, 6), dpi=120)
+    global _STYLE_APPLIED
+    if not _STYLE_APPLIED:
+        plt.style.use("default")
+        _STYLE_APPLIED = True
+
+    if fig is None:
+        fig = plt.figure(figsize=(10, 6), dpi=120)
+    else:
+        fig.clear()
+
     gs = gridspec.GridSpec(2, 2, height_ratios=[1, 1.3])
 
     ax_net = fig.add_subplot(gs[0, :])
@@ -67,7 +191,8 @@ def init_network_axes(ax):
     """
     Draw a simple 3-layer fully connected network schematic.
 
-    Returns: list of line artists to be updated during animation.
+    Returns: LineCollection holding one segment per connection,
+    to be updated during animation.
     """
     ax.set_axis_off()
 
@@ -85,21 +210,19 @@ def init_network_axes(ax):
     ax.plot(np.full_like(y_hidden, x_hidden), y_hidden, **node_style)
     ax.plot(np.full_like(y_output, x_output), y_output, **node_style)
 
-    # Draw connections (store Line2D objects)
-    connection_lines = []
-
+    # Draw connections (a single collection, styled per segment)
     # Input → Hidden
-    for yi in y_input:
-        for yh in y_hidden:
-            line, = ax.plot([x_input, x_hidden], [yi, yh],
-                            color="gray", alpha=0.15, linewidth=1.2)
-            connection_lines.append(line)
+    segments = [[(x_input, yi), (x_hidden, yh)] for yi in y_input for yh in y_hidden]
+    linewidths = [1.2] * len(segments)
 
     # Hidden → Output
-    for yh in y_hidden:
-        line, = ax.plot([x_hidden, x_output], [yh, y_output[0]],
-                        color="gray", alpha=0.15, linewidth=1.4)
-        connection_lines.append(line)
+    segments += [[(x_hidden, yh), (x_output, y_output[0])] for yh in y_hidden]
+    linewidths += [1.4] * len(y_hidden)
+
+    # Alpha goes into the colors: a collection-wide alpha would override
+    # the per-segment alpha set during animation.
+    connections = LineCollection(segments, colors=to_rgba("gray", 0.15), linewidths=linewidths)
+    ax.add_collection(connections)
 
     # Layer labels
     ax.text(x_input, 0.9, "Input layer", ha="center", va="center", fontsize=9)
@@ -109,7 +232,7 @@ def init_network_axes(ax):
     ax.set_xlim(0.0, 1.0)
     ax.set_ylim(0.0, 1.0)
 
-    return connection_lines
+    return connections
 
 
 def init_loss_axes(ax_loss, epochs, train_loss, val_loss):
@@ -117,7 +240,7 @@ def init_loss_axes(ax_loss, epochs, train_loss, val_loss):
     ax_loss.set_xlabel("Epoch")
     ax_loss.set_ylabel("Loss")
     ax_loss.set_xlim(0, epochs[-1])
-    ax_loss.set_ylim(0, max(train_loss[0], val_loss[0]) * 1.1)
+    ax_loss.set_ylim(0, float(max(train_loss[0], val_loss[0])) * 1.1)
 
     (line_train_loss,) = ax_loss.plot([], [], label="Train loss", color="#D9534F")
     (line_val_loss,) = ax_loss.plot([], [], label="Val loss", color="#F0AD4E")
@@ -144,93 +267,250 @@ def init_acc_axes(ax_acc, epochs, train_acc, val_acc):
     return line_train_acc, line_val_acc, point_acc
 
 
-def build_animation(n_epochs: int = 120, interval_ms: int = 80):
+def precompute_activation(n_epochs: int, n_conn: int, levels: int = 20):
     """
-    Create Matplotlib FuncAnimation object.
+    Precompute connection styling for every frame of the animation.
 
-    Returns (fig, anim) so the caller can either show() or save() the animation.
+    A growing, evenly spaced subset of connections is "active" at each frame;
+    active connections get brighter and thicker as training progresses.
+    Brightness is quantized to `levels` steps so consecutive frames mostly
+    share the same style and only changed connections need redrawing.
+
+    Returns (active_mask, alpha, linewidth, color_idx), each of shape
+    (n_epochs, n_conn). color_idx indexes into CONNECTION_COLORS.
+    """
+    progress = np.arange(n_epochs) / max(1, n_epochs - 1)
+    k_active = np.maximum(1, (progress * n_conn).astype(int))
+
+    # The active subset only depends on its size k, so build the mask for
+    # every k in 1..n_conn once and look frames up by their k
+    k_masks = np.zeros((n_conn, n_conn), dtype=bool)
+    for k in range(1, n_conn + 1):
+        k_masks[k - 1, np.linspace(0, n_conn - 1, k).astype(np.int32)] = True
+    active_mask = k_masks[k_active - 1]
+
+    level = (np.round(progress * levels) / levels)[:, None]
+    alpha = np.where(active_mask, 0.4 + 0.4 * level, INACTIVE_ALPHA).astype(np.float32)
+    linewidth = np.where(active_mask, 1.4 + 0.8 * level, INACTIVE_LINEWIDTH).astype(np.float32)
+    color_idx = active_mask.astype(np.uint8)
+
+    return active_mask, alpha, linewidth, color_idx
+
+
+def build_frame_funcs(n_epochs: int = 120, blit: bool = False, fig=None):
+    """
+    Create the figure and the per-frame callbacks that draw the animation.
+
+    An existing figure can be passed as `fig` to be cleared and reused
+    (see create_figure); stop any animation still running on it first.
+
+    With blit=True, the network schematic is blitted by hand: its static
+    part is cached on every full draw and the connections are only
+    re-rendered on frames where their style changes.
+
+    Returns (fig, init, update, n_frames). init() resets the figure to its
+    empty state and update(frame) draws epoch `frame`; both return the
+    artists for FuncAnimation to blit.
     """
     epochs, train_loss, val_loss, train_acc, val_acc = generate_training_curves(n_epochs=n_epochs)
 
-    fig, ax_net, ax_loss, ax_acc = create_figure()
+    fig, ax_net, ax_loss, ax_acc = create_figure(fig)
 
-    conn_lines = init_network_axes(ax_net)
+    connections = init_network_axes(ax_net)
     line_train_loss, line_val_loss, point_loss = init_loss_axes(ax_loss, epochs, train_loss, val_loss)
     line_train_acc, line_val_acc, point_acc = init_acc_axes(ax_acc, epochs, train_acc, val_acc)
 
+    _, conn_alpha, conn_lw, conn_color_idx = precompute_activation(len(epochs), len(connections.get_segments()))
+    # Per-frame RGBA of every connection, looked up from the parsed palette
+    # by color index, so no color is parsed while animating
+    palette = to_rgba_array(CONNECTION_COLORS).astype(np.float32)
+    conn_rgba = palette[conn_color_idx]
+    conn_rgba[..., 3] = conn_alpha
+
+    # Connection style (rgba, linewidth) of the previously drawn frame
+    # (mutable closure state)
+    n_conn = conn_alpha.shape[1]
+    inactive_rgba = np.tile(palette[0], (n_conn, 1))
+    inactive_rgba[:, 3] = INACTIVE_ALPHA
+    inactive_style = (inactive_rgba, np.full(n_conn, INACTIVE_LINEWIDTH, dtype=np.float32))
+    drawn_style = [inactive_style]
+
+    # Full-length curve buffers, NaN (drawn as a gap) past the current epoch,
+    # so each frame only writes the newly reached values. All curves share
+    # the same x, which is set once in init().
+    xs = epochs.astype(np.float32)
+    curve_lines = (line_train_loss, line_val_loss, line_train_acc, line_val_acc)
+    curve_data = (train_loss, val_loss, train_acc, val_acc)
+    curve_ys = tuple(np.full(len(epochs), np.nan, dtype=np.float32) for _ in curve_data)
+    # Number of epochs currently filled into curve_ys (mutable closure state)
+    n_filled = [0]
+
+    # Artists redrawn by FuncAnimation's blitting on every frame
+    animated_artists = (
+        line_train_loss,
+        line_val_loss,
+        point_loss,
+        line_train_acc,
+        line_val_acc,
+        point_acc,
+    )
+
+    # Cached background of the network axes (nodes, labels) without the
+    # connections, refreshed on every full draw (mutable closure state)
+    blit = blit and fig.canvas.supports_blit
+    net_bg = [None]
+
+    def on_draw(event):
+        if fig.canvas.is_saving():
+            # savefig() already draws animated artists; drawing them again
+            # would double their alpha, and the region is not the on-screen one
+            return
+        if ax_net not in fig.axes:
+            # The figure was cleared and reused by a later build
+            fig.canvas.mpl_disconnect(draw_cid)
+            return
+        net_bg[0] = fig.canvas.copy_from_bbox(ax_net.bbox)
+        ax_net.draw_artist(connections)
+
+    def blit_connections():
+        if net_bg[0] is not None:
+            fig.canvas.restore_region(net_bg[0])
+            ax_net.draw_artist(connections)
+            fig.canvas.blit(ax_net.bbox)
+
+    if blit:
+        # Animated artists are skipped by full draws; on_draw adds them back
+        connections.set_animated(True)
+        draw_cid = fig.canvas.mpl_connect("draw_event", on_draw)
+
     def init():
         # Empty initial state
-        line_train_loss.set_data([], [])
-        line_val_loss.set_data([], [])
+        for ys, line in zip(curve_ys, curve_lines):
+            ys[:] = np.nan
+            line.set_data(xs, ys)
+        n_filled[0] = 0
         point_loss.set_data([], [])
-
-        line_train_acc.set_data([], [])
-        line_val_acc.set_data([], [])
         point_acc.set_data([], [])
 
-        # Faint connections
-        for ln in conn_lines:
-            ln.set_alpha(0.1)
-        return (
-            line_train_loss,
-            line_val_loss,
-            point_loss,
-            line_train_acc,
-            line_val_acc,
-            point_acc,
-            *conn_lines,
-        )
+        # Faint connections (same style as inactive ones in update)
+        connections.set_color(inactive_style[0])
+        connections.set_linewidth(inactive_style[1])
+        drawn_style[0] = inactive_style
+        if blit:
+            blit_connections()
+        return animated_artists
 
     def update(frame: int):
-        # Curves up to current epoch
-        e = epochs[: frame + 1]
-
-        line_train_loss.set_data(e, train_loss[: frame + 1])
-        line_val_loss.set_data(e, val_loss[: frame + 1])
-        point_loss.set_data(epochs[frame], train_loss[frame])
-
-        line_train_acc.set_data(e, train_acc[: frame + 1])
-        line_val_acc.set_data(e, val_acc[: frame + 1])
-        point_acc.set_data(epochs[frame], train_acc[frame])
-
-        # Light "activation" of random subset of connections
-        # strength grows with training progress
-        progress = frame / max(1, (len(epochs) - 1))
-        k_active = max(1, int(progress * len(conn_lines)))
-        active_idx = np.linspace(0, len(conn_lines) - 1, k_active).astype(int)
-
-        for i, ln in enumerate(conn_lines):
-            if i in active_idx:
-                ln.set_alpha(0.4 + 0.4 * progress)
-                ln.set_linewidth(1.4 + 0.8 * progress)
-                ln.set_color("#4C72B0")
-            else:
-                ln.set_alpha(0.08)
-                ln.set_linewidth(1.0)
-                ln.set_color("gray")
-
-        return (
-            line_train_loss,
-            line_val_loss,
-            point_loss,
-            line_train_acc,
-            line_val_acc,
-            point_acc,
-            *conn_lines,
-        )
+        # Curves up to current epoch: fill in newly reached epochs, or blank
+        # out the ones past it when the animation restarts / jumps back
+        n = frame + 1
+        lo, hi = sorted((n_filled[0], n))
+        for ys, data, line in zip(curve_ys, curve_data, curve_lines):
+            ys[lo:hi] = data[lo:hi] if n > n_filled[0] else np.nan
+            line.set_ydata(ys)
+        n_filled[0] = n
+
+        point_loss.set_data([epochs[frame]], [train_loss[frame]])
+        point_acc.set_data([epochs[frame]], [train_acc[frame]])
+
+        # Light "activation" of a subset of connections,
+        # strength grows with training progress (see precompute_activation)
+        # The collection is only restyled when some connection's style
+        # differs from the last drawn frame.
+        rgba, lw = conn_rgba[frame], conn_lw[frame]
+        prev_rgba, prev_lw = drawn_style[0]
+        if not (np.array_equal(rgba, prev_rgba) and np.array_equal(lw, prev_lw)):
+            connections.set_color(rgba)
+            connections.set_linewidth(lw)
+            if blit:
+                blit_connections()
+        drawn_style[0] = (rgba, lw)
+
+        return animated_artists
+
+    return fig, init, update, len(epochs)
+
+
+def build_animation(n_epochs: int = 120, interval_ms: int = 80, blit: bool = True, fig=None):
+    """
+    Create Matplotlib FuncAnimation object.
+
+    Blitting only pays off for on-screen playback; when saving, every frame
+    is fully re-rendered anyway, so pass blit=False to skip its bookkeeping.
+    Pass `fig` to draw into an existing figure (e.g. embedded in a GUI).
+
+    Returns (fig, anim) so the caller can either show() or save() the animation.
+    """
+    fig, init, update, n_frames = build_frame_funcs(n_epochs=n_epochs, blit=blit, fig=fig)
 
     anim = animation.FuncAnimation(
         fig,
         update,
         init_func=init,
-        frames=len(epochs),
+        frames=n_frames,
         interval=interval_ms,
-        blit=True,
+        blit=blit,
     )
 
     return fig, anim
 
 
+class BackgroundFFMpegWriter(animation.FFMpegWriter):
+    """
+    FFMpegWriter that feeds frames to ffmpeg from a background thread.
+
+    Frames are still rendered on the calling thread (GUI backends require it),
+    but writing them into ffmpeg's stdin happens on a worker thread, so
+    rendering the next frame overlaps with ffmpeg consuming the previous one.
+    At most `queue_size` rendered frames are buffered.
+    """
+
+    def __init__(self, *args, queue_size: int = 4, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._frames = queue.Queue(maxsize=queue_size)
+        self._pipe_thread = None
+        self._pipe_error = None
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi=dpi)
+        self._pipe_error = None
+        self._pipe_thread = threading.Thread(target=self._pipe_frames, daemon=True)
+        self._pipe_thread.start()
+
+    def _pipe_frames(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            # After a failure keep draining the queue so grab_frame never blocks
+            if self._pipe_error is None:
+                try:
+                    self._proc.stdin.write(frame)
+                except Exception as exc:  # noqa: BLE001  (re-raised on the main thread)
+                    self._pipe_error = exc
+
+    def grab_frame(self, **savefig_kwargs):
+        # The writer controls these itself (same check as Matplotlib's writers)
+        for k in ("dpi", "bbox_inches", "format"):
+            if k in savefig_kwargs:
+                raise TypeError(f"grab_frame got an unexpected keyword argument {k!r}")
+        if self._pipe_error is not None:
+            raise self._pipe_error
+        # All frames must have the same size, even if the figure was resized
+        self.fig.set_size_inches(self._w, self._h)
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format=self.frame_format, dpi=self.dpi, **savefig_kwargs)
+        # Queue a view of the rendered frame rather than a copy of it
+        self._frames.put(buf.getbuffer())
+
+    def finish(self):
+        self._frames.put(None)
+        self._pipe_thread.join()
+        super().finish()
+        if self._pipe_error is not None:
+            raise self._pipe_error
+
+
 def main(save_mp4: bool = False, filename: str = "nn_training_animation.mp4"):
     """
     Entry point for command-line use.
@@ -238,18 +518,46 @@ def main(save_mp4: bool = False, filename: str = "nn_training_animation.mp4"):
     If save_mp4 is True, tries to save the animation as MP4 (requires ffmpeg).
     Otherwise simply shows the animation window.
     """
-    fig, anim = build_animation()
+    interval_ms = 80
+
+    if save_mp4 and not BackgroundFFMpegWriter.isAvailable():
+        print("[WARN] Could not save MP4: ffmpeg not found.")
+        print("       You can still view the animation interactively.")
+        save_mp4 = False
 
     if save_mp4:
-        print(f"[INFO] Saving animation to {filename!r} (requires ffmpeg installed)...")
+        # Render off-screen: the GUI backend's event loop and window
+        # compositing are useless when only writing frames to a file.
+        interactive_backend = matplotlib.get_backend()
+        matplotlib.use("Agg", force=True)
+        fig, saved = None, False
         try:
-            anim.save(filename, writer="ffmpeg", dpi=150, bitrate=2400)
+            fig, init, update, n_frames = build_frame_funcs()
+
+            print(f"[INFO] Saving animation to {filename!r} (requires ffmpeg installed)...")
+            # Drive the frames directly rather than through Animation.save()
+            writer = BackgroundFFMpegWriter(fps=1000 / interval_ms, bitrate=2400)
+            with writer.saving(fig, filename, dpi=150):
+                init()
+                for frame in range(n_frames):
+                    update(frame)
+                    writer.grab_frame()
+            saved = True
             print("[INFO] Done.")
         except Exception as exc:  # noqa: BLE001
             print("[WARN] Could not save MP4:", exc)
             print("       You can still view the animation interactively.")
+        finally:
+            # Leave library callers on the backend they started with
+            if fig is not None:
+                plt.close(fig)
+            plt.switch_backend(interactive_backend)
+
+        if not saved:
+            fig, anim = build_animation(interval_ms=interval_ms)
             plt.show()
     else:
+        fig, anim = build_animation(interval_ms=interval_ms)
         plt.show()
 
 